@@ -0,0 +1,62 @@
+"""Audio post-processing for synthesized WAV data."""
+
+import io
+import logging
+import wave
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+	from numba import njit
+	HAS_NUMBA = True
+except ImportError:
+	# numba 是可选依赖，没有时使用 numpy 实现
+	HAS_NUMBA = False
+
+if HAS_NUMBA:
+	# 不开启 parallel：内核在多个 to_thread 线程中并发调用，Numba 线程层不安全；nogil 已可避免阻塞事件循环
+	@njit(cache=True, fastmath=True, nogil=True)
+	def normalize_int16(samples: np.ndarray, target_peak: float) -> np.ndarray:
+		"""Scale 16-bit PCM samples so the peak reaches target_peak of full scale."""
+		peak = 0
+		for i in range(samples.size):
+			value = abs(np.int32(samples[i]))
+			if value > peak:
+				peak = value
+		out = samples.copy()
+		if peak == 0:
+			return out
+		gain = target_peak * 32767.0 / peak
+		for i in range(samples.size):
+			out[i] = np.int16(min(max(samples[i] * gain, -32768.0), 32767.0))
+		return out
+else:
+	def normalize_int16(samples: np.ndarray, target_peak: float) -> np.ndarray:
+		"""Scale 16-bit PCM samples so the peak reaches target_peak of full scale."""
+		peak = int(np.abs(samples.astype(np.int32)).max(initial=0))
+		if peak == 0:
+			return samples.copy()
+		gain = target_peak * 32767.0 / peak
+		return np.clip(samples * gain, -32768.0, 32767.0).astype(np.int16)
+
+def normalize_wav(data: bytes, target_peak: float = 0.95) -> bytes:
+	"""Peak-normalize a 16-bit PCM WAV file, returning other formats unchanged."""
+	try:
+		with wave.open(io.BytesIO(data), "rb") as reader:
+			params = reader.getparams()
+			frames = reader.readframes(params.nframes)
+	except (wave.Error, EOFError) as e:
+		logger.warning(f"Skipping normalization of unreadable WAV data: {str(e)}")
+		return data
+
+	if params.sampwidth != 2:
+		return data
+
+	samples = normalize_int16(np.frombuffer(frames, dtype="<i2"), target_peak)
+	output = io.BytesIO()
+	with wave.open(output, "wb") as writer:
+		writer.setparams(params)
+		writer.writeframes(samples.astype("<i2").tobytes())
+	return output.getvalue()
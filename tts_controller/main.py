@@ -1,16 +1,67 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException, Response
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import uvicorn
+import asyncio
+from collections.abc import AsyncIterator
+import httpx
+from pydantic import BaseModel
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
 from .models import TTSModelManager
+from .models.manager import HTTP_LIMITS, MAX_LOADED_MODELS
 
-app = FastAPI(title="TTS Controller")
-model_manager = TTSModelManager()
+# 多进程部署时每个进程使用独立的 WORKER_ID，避免 tts-server 端口冲突
+WORKER_ID = int(os.getenv("WORKER_ID", "0"))
+# uvicorn 的多个 worker 共享同一个 WORKER_ID，会互相杀掉对方的 tts-server 并重复加载模型
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+if WEB_CONCURRENCY > 1:
+	raise RuntimeError(f"WEB_CONCURRENCY={WEB_CONCURRENCY} is not supported; run one controller process per WORKER_ID instead")
+model_manager = TTSModelManager(base_port=5002 + WORKER_ID * MAX_LOADED_MODELS)
+
+# 启动时并行预加载的模型（逗号分隔），第一个作为默认模型；设为空字符串可关闭
+DEFAULT_MODEL = os.getenv("TTS_DEFAULT_MODEL", "xtts_v2")
+PRELOAD_MODELS = [m.strip() for m in os.getenv("TTS_PRELOAD_MODELS", DEFAULT_MODEL).split(",") if m.strip()]
+_warmup_task: asyncio.Task[None] | None = None
+
+def warmup() -> None:
+	"""Pre-load models in the background so the first requests don't pay the cold start."""
+	global _warmup_task
+	model_ids = []
+	for model_id in PRELOAD_MODELS:
+		if model_id not in model_manager.models:
+			logger.warning(f"Unknown model {model_id}, skipping pre-load")
+		else:
+			model_ids.append(model_id)
+	if len(model_ids) > model_manager.max_loaded:
+		logger.warning(f"Only pre-loading the first {model_manager.max_loaded} of {len(model_ids)} models")
+		model_ids = model_ids[:model_manager.max_loaded]
+	if model_ids:
+		logger.info(f"Pre-loading models {', '.join(model_ids)}")
+		_warmup_task = asyncio.create_task(model_manager.warmup(model_ids))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	"""Share one pooled HTTP client across all TTS servers for the app's lifetime and stop the servers on shutdown."""
+	app.state.http = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=30.0)
+	model_manager.http_client = app.state.http
+	warmup()
+	yield
+	# 先停止预加载和所有 tts-server，再关闭它们使用的客户端
+	if _warmup_task is not None:
+		_warmup_task.cancel()
+		await asyncio.wait([_warmup_task])
+	await model_manager.shutdown()
+	await app.state.http.aclose()
+
+app = FastAPI(title="TTS Controller", lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="tts_controller/static"), name="static")
@@ -20,22 +71,39 @@ templates = Jinja2Templates(directory="tts_controller/templates")
 async def index(request: Request):
 	"""Render the home page with TTS control panel."""
 	return templates.TemplateResponse(
+		request,
 		"index.html",
-		{"request": request, "title": "TTS Controller", "models": model_manager.list_models()}
+		{"title": "TTS Controller", "models": model_manager.list_models()}
 	)
 
 @app.get("/list_models")
-async def list_models():
+@app.get("/api/models")
+async def list_models(request: Request) -> Response:
 	"""List all available TTS models."""
-	return {"models": model_manager.list_models()}
+	models_json, etag = model_manager.list_models_json()
+	headers = {"ETag": etag, "Cache-Control": "no-cache"}
+	if request.headers.get("if-none-match") == etag:
+		return Response(status_code=304, headers=headers)
+	return Response(
+		content=b'{"models":' + models_json + b"}",
+		media_type="application/json",
+		headers=headers
+	)
+
+class StatusResponse(BaseModel):
+	"""Result of a model load/unload request."""
+	status: str
+	message: str
 
+# 声明返回类型后由 FastAPI 通过 pydantic 直接序列化
 @app.post("/load_model/{model_id}")
-async def load_model(model_id: str):
+@app.post("/api/models/{model_id}/load")
+async def load_model(model_id: str) -> StatusResponse:
 	"""Load a specific TTS model."""
 	try:
 		success = await model_manager.load_model(model_id)
 		if success:
-			return {"status": "success", "message": f"Model {model_id} loaded"}
+			return StatusResponse(status="success", message=f"Model {model_id} loaded")
 		else:
 			raise HTTPException(status_code=500, detail=f"Failed to load model {model_id}")
 	except ValueError as e:
@@ -44,12 +112,13 @@ async def load_model(model_id: str):
 		raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/unload_model/{model_id}")
-async def unload_model(model_id: str):
+@app.post("/api/models/{model_id}/unload")
+async def unload_model(model_id: str) -> StatusResponse:
 	"""Unload a specific TTS model."""
 	try:
 		success = await model_manager.unload_model(model_id)
 		if success:
-			return {"status": "success", "message": f"Model {model_id} unloaded"}
+			return StatusResponse(status="success", message=f"Model {model_id} unloaded")
 		else:
 			raise HTTPException(status_code=500, detail=f"Failed to unload model {model_id}")
 	except ValueError as e:
@@ -57,23 +126,68 @@ async def unload_model(model_id: str):
 	except Exception as e:
 		raise HTTPException(status_code=500, detail=str(e))
 
+# GZipMiddleware 默认不压缩 audio/*，无需额外处理
+AUDIO_HEADERS = {"Content-Disposition": "attachment; filename=synthesis.wav"}
+
 @app.get("/synthesize")
+@app.get("/api/synthesize")
 async def synthesize(
 	text: str,
 	model_id: str | None = None,
 	speaker_id: str | None = None,
 	language_id: str | None = None,
-	style_wav: str | None = None
+	style_wav: str | None = None,
+	normalize: bool = False,
+	no_cache: bool = False
 ) -> Response:
 	"""Synthesize text to speech."""
 	try:
-		audio_data = await model_manager.synthesize(text, model_id, speaker_id, language_id)
+		audio_data = await model_manager.synthesize(
+			text, model_id, speaker_id, language_id, normalize, use_cache=not no_cache
+		)
 		if audio_data:
-			return Response(content=audio_data, media_type="audio/wav")
+			return Response(
+				content=audio_data,
+				media_type="audio/wav",
+				headers=AUDIO_HEADERS
+			)
+		return Response(status_code=500, content="Failed to synthesize text")
+	except Exception as e:
+		logger.error(f"Error during synthesis: {str(e)}")
+		return Response(status_code=500, content=str(e))
+
+@app.get("/synthesize_stream")
+@app.get("/api/synthesize/stream")
+async def synthesize_stream(
+	text: str,
+	model_id: str | None = None,
+	speaker_id: str | None = None,
+	language_id: str | None = None
+) -> Response:
+	"""Synthesize text to speech, streaming audio to the client as the TTS server sends it."""
+	try:
+		stream = model_manager.synthesize_stream(text, model_id, speaker_id, language_id)
+		# 先取第一块，失败时仍能返回错误状态码
+		first_chunk = await anext(stream)
+	except StopAsyncIteration:
 		return Response(status_code=500, content="Failed to synthesize text")
 	except Exception as e:
 		logger.error(f"Error during synthesis: {str(e)}")
 		return Response(status_code=500, content=str(e))
+	return StreamingResponse(_prepend(first_chunk, stream), media_type="audio/wav", headers=AUDIO_HEADERS)
+
+async def _prepend(first_chunk: bytes, stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+	"""Yield an already-read chunk followed by the rest of the stream."""
+	yield first_chunk
+	async for chunk in stream:
+		yield chunk
 
 if __name__ == "__main__":
-	uvicorn.run("tts_controller.main:app", host="0.0.0.0", port=8000, reload=True)
+	uvicorn.run(
+		"tts_controller.main:app",
+		host="0.0.0.0",
+		port=8000,
+		loop="uvloop",
+		http="httptools",
+		reload=False
+	)
@@ -1,119 +1,265 @@
 """TTS Model Manager for handling different TTS models."""
 
 import asyncio
+import hashlib
 import logging
 import subprocess
-import requests
+import httpx
 import os
 import signal
+import socket
 import time
+import random
+import orjson
+import diskcache
 import re
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
 from typing import Any
 
+from ..dsp import normalize_wav
+
+try:
+	import psutil
+except ImportError:
+	# psutil 可选，没有时回退到 lsof
+	psutil = None
+
 logger = logging.getLogger(__name__)
 
+# 合成请求批处理配置，类似 OLLAMA_NUM_PARALLEL；窗口为 0 时不等待，立即发送已排队的请求
+MAX_BATCH_SIZE = int(os.getenv("TTS_MAX_BATCH_SIZE", "8"))
+BATCH_WINDOW_MS = int(os.getenv("TTS_BATCH_WINDOW_MS", "0"))
+# 同时驻留的模型数量上限，超出时按 LRU 淘汰
+MAX_LOADED_MODELS = int(os.getenv("TTS_MAX_LOADED_MODELS", "2"))
+# 可重试的 tts-server 响应状态码，其他错误直接失败
+RETRYABLE_STATUS_CODES = frozenset({429, 503})
+# tts-server 启动（含模型加载）的最长等待时间
+SERVER_START_TIMEOUT = 300
+# 合成结果的磁盘缓存
+AUDIO_CACHE_DIR = os.path.expanduser(os.getenv("TTS_CACHE_DIR", "~/.cache/tts_controller"))
+AUDIO_CACHE_SIZE_GB = float(os.getenv("TTS_CACHE_SIZE_GB", "10"))
+
+# tts-server 连接池配置，空闲连接保持 60 秒以便复用
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60)
+
+# tts-server 首页中 speaker/language 下拉框的解析规则
+_SELECT_RE = re.compile(r'<select[^>]*id="(?P<id>speaker_id|language_id)"[^>]*>(?P<body>.*?)</select>', re.DOTALL)
+_VALUE_RE = re.compile(r'value="([^"]+)"')
+
+# 子进程输出按块读取，\r 和 \n 都视为换行
+_DRAIN_CHUNK_SIZE = 65536
+_LINE_SPLIT_RE = re.compile(rb"[\r\n]")
+
+# 每个模型的 (speakers, languages)，模型重新加载时无需再次获取
+_INFO_CACHE: dict[str, tuple[list[str], list[str]]] = {}
+
 class TTSServer:
 	"""Represents a running TTS server instance."""
 	
-	def __init__(self, model_name: str, port: int):
+	__slots__ = (
+		"model_name", "port", "url", "_root_url", "_tts_url", "process", "pgid",
+		"_log_tasks", "_stderr_tail", "speakers", "languages", "speakers_set", "languages_set", "_client",
+		"inflight"
+	)
+	
+	# 未注入客户端时使用的进程级共享客户端
+	_shared_client : httpx.AsyncClient | None = None
+	
+	def __init__(self, model_name: str, port: int, client: httpx.AsyncClient | None = None):
 		self.model_name : str = model_name
 		self.port : int = port
 		self.url : str = f"http://localhost:{port}"
-		self.process : subprocess.Popen[str] | None = None
+		self._root_url : str = f"{self.url}/"
+		self._tts_url : str = f"{self.url}/api/tts"
+		self.process : asyncio.subprocess.Process | None = None
+		self.pgid : int | None = None
+		# 持续读取子进程输出，避免管道写满阻塞 tts-server
+		self._log_tasks : list[asyncio.Task[None]] = []
+		self._stderr_tail : deque[str] = deque(maxlen=50)
 		self.speakers : list[str] = []
 		self.languages : list[str] = []
+		# 用于合成时 O(1) 校验 speaker/language
+		self.speakers_set : frozenset[str] = frozenset()
+		self.languages_set : frozenset[str] = frozenset()
+		# 共享的 keep-alive 连接池，由应用负责关闭
+		self._client : httpx.AsyncClient = client or TTSServer.get_client()
+		# 请求池发往该 server 的并发请求数上限
+		self.inflight : asyncio.Semaphore = asyncio.Semaphore(MAX_BATCH_SIZE)
+
+	@classmethod
+	def get_client(cls) -> httpx.AsyncClient:
+		"""Get the process-wide client, creating it on first use."""
+		if cls._shared_client is None:
+			cls._shared_client = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=30.0)
+		return cls._shared_client
+
+	async def _fetch_model_info(self, html: str | None = None) -> bool:
+		"""获取模型支持的 speakers 和 languages，同一模型只获取一次"""
+		if self.model_name in _INFO_CACHE:
+			self.speakers, self.languages = _INFO_CACHE[self.model_name]
+			self._update_lookup_sets()
+			return True
 
-	async def _fetch_model_info(self) -> bool:
-		"""获取模型支持的 speakers 和 languages"""
 		try:
-			response = requests.get(f"{self.url}/")
-			if response.status_code == 200:
-				html = response.text
-				# 解析 speakers
-				speaker_match = re.search(r'id="speaker_id"[^>]*>(.*?)</select>', html, re.DOTALL)
-				if speaker_match:
-					self.speakers = re.findall(r'value="([^"]+)"', speaker_match.group(1))
-				
-				# 解析 languages
-				language_match = re.search(r'id="language_id"[^>]*>(.*?)</select>', html, re.DOTALL)
-				if language_match:
-					self.languages = re.findall(r'value="([^"]+)"', language_match.group(1))
-				
-				# 如果没有找到，使用默认值
-				if not self.speakers:
-					self.speakers = ["default"]
-				if not self.languages:
-					self.languages = ["en"]
+			# 优先使用 JSON 接口，不支持时回退到解析首页 HTML
+			speakers = await self._fetch_json_list("/api/speakers")
+			languages = await self._fetch_json_list("/api/languages") if speakers is not None else None
+			if speakers is not None and languages is not None:
+				self.speakers, self.languages = speakers, languages
+			else:
+				if html is None:
+					response = await self._client.get(self._root_url)
+					if response.status_code != 200:
+						logger.error(f"Failed to fetch model info: status {response.status_code}")
+						return False
+					html = response.text
+				# 一次扫描同时解析 speakers 和 languages
+				for match in _SELECT_RE.finditer(html):
+					values = _VALUE_RE.findall(match["body"])
+					if match["id"] == "speaker_id":
+						self.speakers = values
+					else:
+						self.languages = values
+			
+			# 如果没有找到，使用默认值
+			if not self.speakers:
+				self.speakers = ["default"]
+			if not self.languages:
+				self.languages = ["en"]
 			
+			_INFO_CACHE[self.model_name] = (self.speakers, self.languages)
+			self._update_lookup_sets()
 			logger.info(f"Model {self.model_name} supports {len(self.speakers)} speakers and {len(self.languages)} languages")
 			return True
 		except Exception as e:
 			logger.error(f"Failed to fetch model info: {str(e)}")
 			return False
 
-	async def start(self, venv_path: str) -> bool:
-		"""Start the TTS server."""
+	def _update_lookup_sets(self) -> None:
+		"""Rebuild the speaker/language sets used to validate synthesis parameters."""
+		self.speakers_set = frozenset(self.speakers)
+		self.languages_set = frozenset(self.languages)
+
+	async def _fetch_json_list(self, path: str) -> list[str] | None:
+		"""Fetch a JSON list of strings from the server, or None if it isn't available."""
+		response = await self._client.get(f"{self.url}{path}")
+		if response.status_code != 200:
+			return None
+		try:
+			values = response.json()
+		except ValueError:
+			return None
+		if isinstance(values, list) and all(isinstance(value, str) for value in values):
+			return values
+		return None
+
+	async def start(self, argv: tuple[str, ...], env: dict[str, str]) -> bool:
+		"""Start the TTS server from a prebuilt command line, adding the port."""
 		try:
 			# Kill any existing process on the same port
 			await self._kill_process_on_port(self.port)
 			
-			# Construct and execute the command
-			activate_cmd = f"source {os.path.join(venv_path, 'bin/activate')}"
-			server_cmd = f"tts-server --model_name '{self.model_name}' --use_cuda --port {self.port}"
-			full_cmd = f"{activate_cmd} && {server_cmd}"
+			argv = (*argv, "--port", str(self.port))
 			
 			logger.info(f"Starting TTS server for {self.model_name} on port {self.port}")
-			logger.debug(f"Command: {full_cmd}")
+			logger.debug(f"Command: {argv}")
 			
 			# Start the server process
-			self.process = subprocess.Popen(
-				full_cmd,
-				shell=True,
-				stdout=subprocess.PIPE,
-				stderr=subprocess.PIPE,
-				text=True,
-				preexec_fn=os.setsid  # Create a new process group
+			self.process = await asyncio.create_subprocess_exec(
+				*argv,
+				stdout=asyncio.subprocess.PIPE,
+				stderr=asyncio.subprocess.PIPE,
+				env=env,
+				start_new_session=True  # Create a new process group
 			)
+			# 新会话中进程组 ID 等于子进程 PID
+			self.pgid = self.process.pid
+			self._stderr_tail.clear()
+			self._log_tasks = [
+				asyncio.create_task(self._drain(self.process.stdout, logger.debug)),
+				asyncio.create_task(self._drain(self.process.stderr, self._log_stderr))
+			]
 			
-			# Wait for server to start
-			max_attempts = 120  
-			for attempt in range(max_attempts):
+			# Wait for server to start, backing off from 50ms up to 2s with ±25% jitter
+			deadline = time.monotonic() + SERVER_START_TIMEOUT
+			backoff = 0.05
+			while time.monotonic() < deadline:
+				if self.process.returncode is not None:
+					stderr = await self._read_stderr()
+					logger.error(f"TTS server exited with code {self.process.returncode}: {stderr}")
+					return False
 				try:
 					# 使用根路径检查服务器是否启动
-					response = requests.get(f"{self.url}/", timeout=1)
+					response = await self._client.get(self._root_url, timeout=1.0)
 					if response.status_code == 200:
 						logger.info(f"TTS server started successfully on port {self.port}")
-						# 获取模型信息
-						if await self._fetch_model_info():
+						# 获取模型信息，复用探测得到的首页 HTML
+						if await self._fetch_model_info(response.text):
 							return True
 						else:
 							logger.warning("Server started but failed to fetch model info")
 							return True
-				except requests.exceptions.RequestException:
-					await asyncio.sleep(1)
-					continue
+				except httpx.RequestError:
+					pass
+				await asyncio.sleep(backoff * random.uniform(0.75, 1.25))
+				backoff = min(backoff * 1.5, 2.0)
 			
-			logger.error(f"TTS server failed to start on port {self.port} after {max_attempts} attempts")
+			logger.error(f"TTS server failed to start on port {self.port} within {SERVER_START_TIMEOUT} seconds")
 			return False
 			
 		except Exception as e:
 			logger.error(f"Failed to start TTS server {self.model_name}: {str(e)}")
-			if self.process and self.process.stderr:
-				stderr = self.process.stderr.read()
-				logger.error(f"Process stderr: {stderr}")
+			if self._stderr_tail:
+				logger.error(f"Process stderr: {await self._read_stderr()}")
 			return False
 
+	async def _read_stderr(self) -> str:
+		"""Get the last lines an exited server process wrote to stderr."""
+		# 等待输出读取完毕
+		if self._log_tasks:
+			await asyncio.wait(self._log_tasks, timeout=1)
+		return "\n".join(self._stderr_tail)
+
+	async def _drain(self, stream: asyncio.StreamReader | None, log: Callable[[str], None]) -> None:
+		"""Forward a child output stream to the log line by line until EOF."""
+		if stream is None:
+			return
+		# 按块读取并按 \r/\n 分行：tqdm 进度条只用 \r 刷新，readline() 超过缓冲上限会报错并停止读取
+		pending = b""
+		while chunk := await stream.read(_DRAIN_CHUNK_SIZE):
+			*lines, pending = _LINE_SPLIT_RE.split(pending + chunk)
+			if len(pending) > _DRAIN_CHUNK_SIZE:
+				lines.append(pending)
+				pending = b""
+			for line in lines:
+				if line.strip():
+					log(f"[{self.model_name}] {line.decode(errors='replace').rstrip()}")
+		if pending.strip():
+			log(f"[{self.model_name}] {pending.decode(errors='replace').rstrip()}")
+
+	def _log_stderr(self, line: str) -> None:
+		"""Log a stderr line and keep it for failure reports."""
+		self._stderr_tail.append(line)
+		logger.info(line)
+
 	async def stop(self) -> bool:
 		"""Stop the TTS server."""
 		try:
-			if self.process:
+			if self.process and self.pgid is not None:
 				# Kill the entire process group
-				os.killpg(os.getpgid(self.process.pid), signal.SIGTERM)
 				try:
-					self.process.wait(timeout=5)
-				except subprocess.TimeoutExpired:
-					os.killpg(os.getpgid(self.process.pid), signal.SIGKILL)
+					os.killpg(self.pgid, signal.SIGTERM)
+					try:
+						await asyncio.wait_for(self.process.wait(), timeout=5)
+					except asyncio.TimeoutError:
+						os.killpg(self.pgid, signal.SIGKILL)
+						await self.process.wait()
+				except ProcessLookupError:
+					pass  # 进程组已经退出
 				self.process = None
+				self.pgid = None
 			return True
 		except Exception as e:
 			logger.error(f"Failed to stop TTS server {self.model_name}: {str(e)}")
@@ -122,173 +268,341 @@ class TTSServer:
 	async def _kill_process_on_port(self, port: int) -> None:
 		"""Kill any existing process running on the specified port."""
 		try:
-			# Find process using the port
-			result = subprocess.run(
-				f"lsof -i :{port} -t",
-				shell=True,
-				capture_output=True,
-				text=True
-			)
-			
-			if result.stdout:
-				pid = int(result.stdout.strip())
+			# 常见情况：端口空闲，直接返回
+			with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+				sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 				try:
-					os.kill(pid, signal.SIGTERM)
-					await asyncio.sleep(1)  # Give it a second to terminate
-					try:
-						os.kill(pid, 0)  # Check if process still exists
-						os.kill(pid, signal.SIGKILL)  # Force kill if still running
-					except OSError:
-						pass  # Process already terminated
-				except ProcessLookupError:
-					pass  # Process already gone
+					sock.bind(("", port))
+					return
+				except OSError:
+					pass
+
+			# 扫描连接和等待进程退出都会阻塞，放到线程中执行
+			await asyncio.to_thread(self._sync_kill_process_on_port, port)
 		except Exception as e:
 			logger.warning(f"Failed to kill process on port {port}: {str(e)}")
 
+	@staticmethod
+	def _sync_kill_process_on_port(port: int) -> None:
+		"""Terminate the process listening on the port, escalating to kill after a second."""
+		if psutil is None:
+			TTSServer._sync_kill_process_on_port_lsof(port)
+			return
+
+		for conn in psutil.net_connections(kind="inet"):
+			if conn.laddr.port != port or conn.status != psutil.CONN_LISTEN or not conn.pid:
+				continue
+			try:
+				proc = psutil.Process(conn.pid)
+				proc.terminate()
+				try:
+					proc.wait(timeout=1)  # Give it a second to terminate
+				except psutil.TimeoutExpired:
+					proc.kill()  # Force kill if still running
+			except psutil.NoSuchProcess:
+				pass  # Process already gone
+
+	@staticmethod
+	def _sync_kill_process_on_port_lsof(port: int) -> None:
+		"""Fallback for _sync_kill_process_on_port when psutil is not installed."""
+		result = subprocess.run(
+			["lsof", "-t", f"-iTCP:{port}", "-sTCP:LISTEN"],
+			capture_output=True,
+			text=True
+		)
+		for pid in map(int, result.stdout.split()):
+			try:
+				os.kill(pid, signal.SIGTERM)
+				# Give it up to a second to terminate, polling with backoff
+				deadline = time.monotonic() + 1.0
+				delay = 0.01
+				while time.monotonic() < deadline:
+					time.sleep(delay)
+					os.kill(pid, 0)  # Raises once the process has exited
+					delay = min(delay * 2, 0.2)
+				os.kill(pid, signal.SIGKILL)  # Force kill if still running
+			except ProcessLookupError:
+				pass  # Process already gone
+
 	async def synthesize(self, text: str, speaker_id: str | None = None, language_id: str | None = None) -> bytes | None:
 		"""Synthesize text using the TTS server."""
 		try:
-			params = {
-				"text": text,
-				"style_wav": ""  # 这是 tts-server 需要的参数
-			}
-			if speaker_id and speaker_id in self.speakers:
-				params["speaker_id"] = speaker_id
-			if language_id and language_id in self.languages:
-				params["language_id"] = language_id
-			
-			# 增加超时设置和重试机制
-			max_retries = 3
-			retry_delay = 1
-			timeout = 30  # 30秒超时
+			return b"".join([chunk async for chunk in self.synthesize_stream(text, speaker_id, language_id)])
+		except Exception as e:
+			logger.error(f"Failed to synthesize text: {str(e)}")
+			return None
 
-			for attempt in range(max_retries):
-				try:
-					response = requests.get(
-						f"{self.url}/api/tts",
-						params=params,
-						timeout=timeout
-					)
-					
+	async def synthesize_stream(self, text: str, speaker_id: str | None = None, language_id: str | None = None) -> AsyncIterator[bytes]:
+		"""Synthesize text using the TTS server, yielding audio chunks as they arrive.
+
+		Failures before the first chunk are retried; anything unrecoverable raises.
+		"""
+		params = {
+			"text": text,
+			"style_wav": ""  # 这是 tts-server 需要的参数
+		}
+		if speaker_id and speaker_id in self.speakers_set:
+			params["speaker_id"] = speaker_id
+		if language_id and language_id in self.languages_set:
+			params["language_id"] = language_id
+		
+		# 增加超时设置和重试机制
+		max_retries = 3
+		timeout = 30  # 30秒超时
+
+		for attempt in range(max_retries):
+			started = False
+			try:
+				async with self._client.stream("GET", self._tts_url, params=params, timeout=timeout) as response:
 					if response.status_code == 200:
-						return response.content
-					elif response.status_code == 503:
+						async for chunk in response.aiter_bytes(65536):
+							started = True
+							yield chunk
+						return
+					elif response.status_code in RETRYABLE_STATUS_CODES:
 						# 服务暂时不可用，等待后重试
-						logger.warning(f"TTS server temporarily unavailable, retrying... (attempt {attempt + 1}/{max_retries})")
-						await asyncio.sleep(retry_delay)
-						continue
+						logger.warning(f"TTS server temporarily unavailable ({response.status_code}), retrying... (attempt {attempt + 1}/{max_retries})")
 					else:
-						error_msg = response.text
-						logger.error(f"Synthesis failed with status {response.status_code}: {error_msg}")
-						return None
-						
-				except requests.exceptions.Timeout:
-					logger.warning(f"Request timeout, retrying... (attempt {attempt + 1}/{max_retries})")
-					await asyncio.sleep(retry_delay)
-					continue
-				except requests.exceptions.ConnectionError:
-					logger.warning(f"Connection error, retrying... (attempt {attempt + 1}/{max_retries})")
-					await asyncio.sleep(retry_delay)
-					continue
-				except Exception as e:
-					logger.error(f"Unexpected error during synthesis: {str(e)}")
-					return None
-			
-			logger.error("Max retries reached, synthesis failed")
-			return None
-			
-		except Exception as e:
-			logger.error(f"Failed to synthesize text: {str(e)}")
-			return None
+						error_msg = (await response.aread()).decode(errors="replace")
+						raise RuntimeError(f"Synthesis failed with status {response.status_code}: {error_msg}")
+					
+			except httpx.TimeoutException:
+				# 已经输出部分音频时无法重试
+				if started:
+					raise
+				logger.warning(f"Request timeout, retrying... (attempt {attempt + 1}/{max_retries})")
+			except httpx.ConnectError:
+				logger.warning(f"Connection error, retrying... (attempt {attempt + 1}/{max_retries})")
+
+			if attempt + 1 < max_retries:
+				await asyncio.sleep(self._retry_delay(attempt))
+		
+		raise RuntimeError("Max retries reached, synthesis failed")
+
+	@staticmethod
+	def _retry_delay(attempt: int) -> float:
+		"""Exponential backoff from 1s, capped at 30s, with ±50% jitter to avoid retry storms."""
+		return min(1.0 * 2 ** attempt, 30.0) * (1 + random.uniform(-0.5, 0.5))
+
+@dataclass(slots=True)
+class ModelSlot:
+	"""A configured model and the server currently serving it, if any."""
+	name: str
+	model_name: str
+	argv: tuple[str, ...]
+	instance: TTSServer | None = None
+	loaded: bool = False
+	port: int | None = None
+
+@dataclass(slots=True)
+class PoolItem:
+	"""A synthesis request waiting in the request pool."""
+	server: TTSServer
+	text: str
+	speaker_id: str | None
+	language_id: str | None
+	future: asyncio.Future[bytes | None]
 
 class TTSModelManager:
 	"""Manages the loading and unloading of TTS models."""
 	
-	def __init__(self, venv_path: str = "~/test/tts/.venv"):
+	def __init__(self, venv_path: str = "~/test/tts/.venv", base_port: int = 5002, max_loaded: int = MAX_LOADED_MODELS):
 		self.venv_path : str = os.path.expanduser(venv_path)
-		self.base_port : int = 5002
-		self.models: dict[str, dict[str, Any]] = {
-			"xtts_v2": {
-				"name": "XTTS v2",
-				"model_name": "tts_models/multilingual/multi-dataset/xtts_v2",
-				"loaded": False,
-				"instance": None
-			},
-			"greek_vits": {
-				"name": "greek vits",
-				"model_name": "tts_models/el/cv/vits",
-				"loaded": False,
-				"instance": None
-			},
-			"tacotron2-DDC": {
-				"name": "tocotran2 DDC",
-				"model_name": "tts_models/ja/kokoro/tacotron2-DDC",
-				"loaded": False,
-				"instance": None
-			},
-			"bark": {
-				"name": "Bark",
-				"model_name": "tts_models/multilingual/multi-dataset/bark",
-				"loaded": False,
-				"instance": None
-			}
+		self.base_port : int = base_port
+		self.max_loaded : int = max(1, max_loaded)
+		# 直接执行 venv 中的 tts-server，不经过 shell 和 activate 脚本
+		bin_dir = os.path.join(self.venv_path, "bin")
+		self._server_env: dict[str, str] = {
+			**os.environ,
+			"VIRTUAL_ENV": self.venv_path,
+			"PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+		}
+		self.models: dict[str, ModelSlot] = {
+			"xtts_v2": self._make_slot("XTTS v2", "tts_models/multilingual/multi-dataset/xtts_v2"),
+			"greek_vits": self._make_slot("greek vits", "tts_models/el/cv/vits"),
+			"tacotron2-DDC": self._make_slot("tocotran2 DDC", "tts_models/ja/kokoro/tacotron2-DDC"),
+			"bark": self._make_slot("Bark", "tts_models/multilingual/multi-dataset/bark")
 		}
 		self.active_model: str | None = None
+		# 应用级共享的 HTTP 客户端，在 lifespan 中设置；未设置时使用 TTSServer 的共享客户端
+		self.http_client: httpx.AsyncClient | None = None
+		# 已加载的 server，按最近使用排序（末尾为最近使用）
+		self._resident: OrderedDict[str, TTSServer] = OrderedDict()
+		# 保护模型状态和端口分配，避免端口冲突和重复卸载；server 启动期间不持有
+		self._lock = asyncio.Lock()
+		# 正在启动的模型，计入驻留数量上限
+		self._loading: dict[str, asyncio.Task[bool]] = {}
+		# 释放的端口排到队尾，避免立刻复用刚被关闭的端口
+		self._free_ports: deque[int] = deque(range(base_port, base_port + self.max_loaded))
+		# list_models 的缓存，模型状态变化时失效
+		self._models_cache: dict[str, dict[str, Any]] | None = None
+		self._models_json: bytes = b""
+		self._models_etag: str = ""
+		# 待合成请求池，由 _serve_loop 批量发送
+		self._pool: asyncio.Queue[PoolItem] = asyncio.Queue()
+		self._worker_task: asyncio.Task[None] | None = None
+		# 发送中的任务
+		self._inflight: set[asyncio.Task[None]] = set()
+		self._audio_cache = diskcache.Cache(AUDIO_CACHE_DIR, size_limit=int(AUDIO_CACHE_SIZE_GB * 2**30))
+
+	def _make_slot(self, name: str, model_name: str) -> ModelSlot:
+		"""Create a model slot with its tts-server command line precomputed."""
+		argv = (
+			os.path.join(self.venv_path, "bin", "tts-server"),
+			"--model_name", model_name,
+			"--use_cuda"
+		)
+		return ModelSlot(name=name, model_name=model_name, argv=argv)
 
 	async def load_model(self, model_id: str) -> bool:
-		"""Load a specific TTS model."""
+		"""Load a specific TTS model and make it the active one."""
 		if model_id not in self.models:
 			raise ValueError(f"Unknown model: {model_id}")
 
-		if self.active_model:
-			logger.info(f"Unloading active model {self.active_model} before loading {model_id}")
-			await self.unload_model(self.active_model)
+		async with self._lock:
+			if model_id in self._resident:
+				self._resident.move_to_end(model_id)
+				self.active_model = model_id
+				self._invalidate_models_cache()
+				logger.info(f"Model {model_id} is already loaded")
+				return True
+
+			# 同一模型正在加载时等待同一个任务
+			task = self._loading.get(model_id)
+			if task is None:
+				if not await self._make_room(model_id):
+					return False
+				port = self._free_ports.popleft()
+				task = asyncio.create_task(self._start_server(model_id, port))
+				self._loading[model_id] = task
 
+		# 启动 server 不持有锁，多个模型可以同时加载
+		try:
+			if not await asyncio.shield(task):
+				return False
+		except asyncio.CancelledError:
+			# 启动被卸载或关闭取消；调用方自身被取消时继续抛出
+			if not task.cancelled():
+				raise
+			logger.info(f"Loading of model {model_id} was cancelled")
+			return False
+		async with self._lock:
+			if model_id in self._resident:
+				self.active_model = model_id
+				self._invalidate_models_cache()
+		return True
+
+	async def warmup(self, model_ids: list[str]) -> None:
+		"""Load several models concurrently, leaving the first one active."""
+		results = await asyncio.gather(*(self.load_model(model_id) for model_id in model_ids), return_exceptions=True)
+		for model_id, result in zip(model_ids, results):
+			if result is not True:
+				logger.warning(f"Failed to pre-load model {model_id}: {result}")
+		if model_ids and model_ids[0] in self._resident:
+			self.active_model = model_ids[0]
+			self._invalidate_models_cache()
+
+	async def _make_room(self, model_id: str) -> bool:
+		"""Evict least recently used models until another one fits; the caller must hold the lock."""
+		while len(self._resident) + len(self._loading) >= self.max_loaded:
+			if not self._resident:
+				logger.error(f"Cannot load model {model_id}: {len(self._loading)} models are already loading")
+				return False
+			victim = next(iter(self._resident))
+			logger.info(f"Evicting least recently used model {victim} before loading {model_id}")
+			if not await self._unload_model(victim):
+				return False
+		return True
+
+	async def _start_server(self, model_id: str, port: int) -> bool:
+		"""Start a server for the model on a reserved port and register it once it is ready."""
+		model = self.models[model_id]
+		server = TTSServer(model.model_name, port, self.http_client)
 		try:
-			model = self.models[model_id]
-			port = self.base_port + len([m for m in self.models.values() if m["loaded"]])
-			
 			logger.info(f"Starting to load model {model_id} on port {port}")
-			server = TTSServer(model["model_name"], port)
 			
-			# 设置更长的启动等待时间
-			start_timeout = 300  # 5分钟超时
 			start_time = time.time()
 			
-			if await server.start(self.venv_path):
-				model["loaded"] = True
-				model["instance"] = server
-				self.active_model = model_id
+			if await server.start(model.argv, self._server_env):
+				async with self._lock:
+					model.loaded = True
+					model.instance = server
+					model.port = port
+					self._resident[model_id] = server
+					self._loading.pop(model_id, None)
+					if self._worker_task is None or self._worker_task.done():
+						self._worker_task = asyncio.create_task(self._serve_loop())
+					self._invalidate_models_cache()
 				
 				elapsed_time = time.time() - start_time
 				logger.info(f"Successfully loaded model {model_id} in {elapsed_time:.1f} seconds")
 				return True
 				
-			logger.error(f"Failed to load model {model_id} within {start_timeout} seconds")
-			return False
+			logger.error(f"Failed to load model {model_id}")
+			# 释放启动失败的进程
+			await server.stop()
 			
+		except asyncio.CancelledError:
+			await server.stop()
+			self._loading.pop(model_id, None)
+			self._free_ports.append(port)
+			raise
 		except Exception as e:
 			logger.error(f"Failed to load model {model_id}: {str(e)}")
-			return False
+		
+		self._loading.pop(model_id, None)
+		self._free_ports.append(port)
+		return False
 
 	async def unload_model(self, model_id: str) -> bool:
 		"""Unload a specific TTS model."""
 		if model_id not in self.models:
 			raise ValueError(f"Unknown model: {model_id}")
 
-		if not self.models[model_id]["loaded"]:
+		# 正在启动的模型取消启动，避免卸载后又变为驻留
+		task = self._loading.get(model_id)
+		if task is not None:
+			task.cancel()
+			await asyncio.wait([task])
+
+		async with self._lock:
+			return await self._unload_model(model_id)
+
+	async def shutdown(self) -> None:
+		"""Cancel pending loads and requests and stop every resident server."""
+		tasks = [*self._loading.values(), *self._inflight]
+		if self._worker_task is not None:
+			tasks.append(self._worker_task)
+		for task in tasks:
+			task.cancel()
+		if tasks:
+			await asyncio.wait(tasks)
+
+		async with self._lock:
+			for model_id in list(self._resident):
+				await self._unload_model(model_id)
+
+	async def _unload_model(self, model_id: str) -> bool:
+		"""Unload a model; the caller must hold the lock."""
+		if not self.models[model_id].loaded:
 			return True
 
 		try:
 			model = self.models[model_id]
-			if model["instance"]:
-				await model["instance"].stop()
+			if model.instance:
+				await model.instance.stop()
+			if model.port is not None:
+				self._free_ports.append(model.port)
 			
-			model["loaded"] = False
-			model["instance"] = None
+			model.loaded = False
+			model.instance = None
+			model.port = None
+			self._resident.pop(model_id, None)
 			
 			if self.active_model == model_id:
-				self.active_model = None
+				# 回退到最近使用的驻留模型
+				self.active_model = next(reversed(self._resident), None)
+			self._invalidate_models_cache()
 			
 			logger.info(f"Unloaded model: {model_id}")
 			return True
@@ -296,8 +610,42 @@ class TTSModelManager:
 			logger.error(f"Failed to unload model {model_id}: {str(e)}")
 			return False
 
-	async def synthesize(self, text: str, model_id: str | None = None, speaker_id: str | None = None, language_id: str | None = None) -> bytes | None:
-		"""Synthesize text using the specified or active model."""
+	async def synthesize(self, text: str, model_id: str | None = None, speaker_id: str | None = None, language_id: str | None = None, normalize: bool = False, use_cache: bool = True) -> bytes | None:
+		"""Synthesize text using the specified or active model, optionally peak-normalizing the audio.
+
+		Results are cached on disk per (model, speaker, language, text); use_cache=False
+		skips the lookup and refreshes the cached entry.
+		"""
+		model_id, server = self._get_server(model_id)
+		
+		cache_key = hashlib.blake2b(
+			f"{model_id}|{speaker_id or ''}|{language_id or ''}|{text}".encode(),
+			digest_size=16
+		).hexdigest()
+		audio_data = await asyncio.to_thread(self._audio_cache.get, cache_key) if use_cache else None
+
+		if audio_data is None:
+			future: asyncio.Future[bytes | None] = asyncio.get_running_loop().create_future()
+			await self._pool.put(PoolItem(server, text, speaker_id, language_id, future))
+			audio_data = await future
+			if audio_data:
+				await asyncio.to_thread(self._audio_cache.set, cache_key, audio_data)
+
+		if normalize and audio_data:
+			audio_data = await asyncio.to_thread(normalize_wav, audio_data)
+		return audio_data
+
+	def synthesize_stream(self, text: str, model_id: str | None = None, speaker_id: str | None = None, language_id: str | None = None) -> AsyncIterator[bytes]:
+		"""Stream synthesized audio straight from the model's server.
+
+		Bypasses the request pool, audio cache and normalization; the model is
+		validated here so errors surface before the stream is consumed.
+		"""
+		_, server = self._get_server(model_id)
+		return server.synthesize_stream(text, speaker_id, language_id)
+
+	def _get_server(self, model_id: str | None) -> tuple[str, TTSServer]:
+		"""Resolve the specified or active model to its running server, marking it recently used."""
 		model_id = model_id or self.active_model
 		if not model_id:
 			raise ValueError("No active model")
@@ -306,29 +654,98 @@ class TTSModelManager:
 			raise ValueError(f"Unknown model: {model_id}")
 		
 		model = self.models[model_id]
-		if not model["loaded"] or not model["instance"]:
+		if not model.loaded or not model.instance:
 			raise ValueError(f"Model {model_id} is not loaded")
-		
-		return await model["instance"].synthesize(text, speaker_id, language_id)
+		# 合成请求也更新 LRU 顺序，交替使用的模型不会被淘汰
+		if model_id in self._resident:
+			self._resident.move_to_end(model_id)
+		return model_id, model.instance
+
+	async def _serve_loop(self) -> None:
+		"""Drain the request pool and dispatch everything waiting as one batch.
+
+		The first request is sent as soon as it arrives; requests that queue up
+		meanwhile are picked up together on the next iteration. The coqui
+		tts-server has no batched endpoint, so each request is fanned out as its
+		own task over the shared keep-alive connection pool and the loop goes
+		straight back to the pool without waiting for the batch to finish.
+		"""
+		loop = asyncio.get_running_loop()
+		while True:
+			batch = [await self._pool.get()]
+			while len(batch) < MAX_BATCH_SIZE and not self._pool.empty():
+				batch.append(self._pool.get_nowait())
+
+			# 可选：等待窗口内的后续请求
+			deadline = loop.time() + BATCH_WINDOW_MS / 1000
+			while len(batch) < MAX_BATCH_SIZE:
+				remaining = deadline - loop.time()
+				if remaining <= 0:
+					break
+				try:
+					batch.append(await asyncio.wait_for(self._pool.get(), remaining))
+				except asyncio.TimeoutError:
+					break
+
+			logger.debug(f"Dispatching synthesis batch of {len(batch)} requests")
+			# 不等待本批完成，慢模型或失败的上游不会拖住其他请求
+			for item in batch:
+				task = asyncio.create_task(self._dispatch(item))
+				self._inflight.add(task)
+				task.add_done_callback(self._inflight.discard)
+
+	async def _dispatch(self, item: PoolItem) -> None:
+		"""Send one pooled request, keeping at most MAX_BATCH_SIZE in flight per server."""
+		async with item.server.inflight:
+			# 调用方可能已经断开
+			if item.future.done():
+				return
+			try:
+				result = await item.server.synthesize(item.text, item.speaker_id, item.language_id)
+			except Exception as e:
+				if not item.future.done():
+					item.future.set_exception(e)
+				return
+		if not item.future.done():
+			item.future.set_result(result)
 
 	def get_active_model(self) -> str | None:
 		"""Get the currently active model ID."""
 		return self.active_model
 
-	def list_models(self) -> dict[str, dict[str, str]]:
+	def _invalidate_models_cache(self) -> None:
+		"""Drop the cached model listing after a load/unload."""
+		self._models_cache = None
+
+	def list_models(self) -> dict[str, dict[str, Any]]:
 		"""List all available models with their status."""
+		if self._models_cache is None:
+			self._models_cache = self._build_models_list()
+			self._models_json = orjson.dumps(self._models_cache)
+			# gzip 会改变响应体，因此使用弱 ETag
+			self._models_etag = f'W/"{hashlib.blake2b(self._models_json, digest_size=8).hexdigest()}"'
+		return self._models_cache
+
+	def list_models_json(self) -> tuple[bytes, str]:
+		"""Get the model listing as serialized JSON together with its ETag."""
+		self.list_models()
+		return self._models_json, self._models_etag
+
+	def _build_models_list(self) -> dict[str, dict[str, Any]]:
+		"""Build the model listing from the current model state."""
 		result = {}
 		for model_id, model in self.models.items():
 			model_info = {
-				"name": model["name"],
-				"model_name": model["model_name"],
-				"loaded": model["loaded"],
+				"name": model.name,
+				"model_name": model.model_name,
+				"loaded": model.loaded,
+				"active": model_id == self.active_model,
 				"speakers": [],
 				"languages": []
 			}
-			if model["loaded"] and model["instance"]:
-				model_info["port"] = model["instance"].port
-				model_info["speakers"] = model["instance"].speakers
-				model_info["languages"] = model["instance"].languages
+			if model.loaded and model.instance:
+				model_info["port"] = model.port
+				model_info["speakers"] = model.instance.speakers
+				model_info["languages"] = model.instance.languages
 			result[model_id] = model_info
 		return result